@@ -1,77 +1,180 @@
 """Configuration constants for the Fretboard Trainer application."""
 
-# Music theory constants
-NATURAL_NOTES = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
-NOTES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+import sys
+from types import MappingProxyType
+
+import numpy as np
+
+# Music theory constants (note names are interned and tables are read-only)
+NOTES = tuple(sys.intern(n) for n in
+              ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'))
+NATURAL_NOTES = tuple(sys.intern(n) for n in ('A', 'B', 'C', 'D', 'E', 'F', 'G'))
 A4_FREQUENCY = 440
 
 # Note to semitone mapping (C = 0)
-NOTE_TO_SEMITONE = {
-    'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4, 'F': 5, 
-    'F#': 6, 'G': 7, 'G#': 8, 'A': 9, 'A#': 10, 'B': 11
-}
-SEMITONE_TO_NOTE = {v: k for k, v in NOTE_TO_SEMITONE.items()}
-
-# Fretboard mapping
-FRETBOARD = {
-    'E': {  # Low E string
-        'E': 0, 'F': 1, 'F#': 2, 'G': 3, 'G#': 4, 'A': 5,
-        'A#': 6, 'B': 7, 'C': 8, 'C#': 9, 'D': 10, 'D#': 11,
-    },
-    'A': {
-        'A': 0, 'A#': 1, 'B': 2, 'C': 3, 'C#': 4, 'D': 5,
-        'D#': 6, 'E': 7, 'F': 8, 'F#': 9, 'G': 10, 'G#': 11,
-    },
-    'D': {
-        'D': 0, 'D#': 1, 'E': 2, 'F': 3, 'F#': 4, 'G': 5,
-        'G#': 6, 'A': 7, 'A#': 8, 'B': 9, 'C': 10, 'C#': 11,
-    },
-    'G': {
-        'G': 0, 'G#': 1, 'A': 2, 'A#': 3, 'B': 4, 'C': 5,
-        'C#': 6, 'D': 7, 'D#': 8, 'E': 9, 'F': 10, 'F#': 11,
-    },
-    'B': {
-        'B': 0, 'C': 1, 'C#': 2, 'D': 3, 'D#': 4, 'E': 5,
-        'F': 6, 'F#': 7, 'G': 8, 'G#': 9, 'A': 10, 'A#': 11,
-    },
-    'e': {  # High E string
-        'E': 0, 'F': 1, 'F#': 2, 'G': 3, 'G#': 4, 'A': 5,
-        'A#': 6, 'B': 7, 'C': 8, 'C#': 9, 'D': 10, 'D#': 11,
-    }
+NOTE_TO_SEMITONE = MappingProxyType({n: i for i, n in enumerate(NOTES)})
+SEMITONE_TO_NOTE = NOTES  # NOTES is ordered by semitone, so index it directly
+
+# Fretboard layout: strings from low to high and the note each one is tuned to
+STRINGS = tuple(sys.intern(s) for s in ('E', 'A', 'D', 'G', 'B', 'e'))
+OPEN_STRING_NOTES = ('E', 'A', 'D', 'G', 'B', 'E')
+STRING_INDEX = MappingProxyType({s: i for i, s in enumerate(STRINGS)})
+
+# Fretboard mapping (string -> note -> fret), derived from the open-string
+# notes. Strings tuned to the same note (low and high E) share one row
+# object, so treat the rows as immutable.
+_FRETBOARD_ROWS = {
+    open_note: MappingProxyType({
+        SEMITONE_TO_NOTE[(NOTE_TO_SEMITONE[open_note] + fret) % 12]: fret
+        for fret in range(12)
+    })
+    for open_note in set(OPEN_STRING_NOTES)
 }
+FRETBOARD = MappingProxyType({
+    string: _FRETBOARD_ROWS[open_note]
+    for string, open_note in zip(STRINGS, OPEN_STRING_NOTES)
+})
+
+# Frets of each semitone on each string (string -> semitone -> tuple of frets)
+SEMITONE_FRETS = MappingProxyType({
+    string: tuple(
+        tuple(fret for note, fret in row.items() if NOTE_TO_SEMITONE[note] == semi)
+        for semi in range(12)
+    )
+    for string, row in FRETBOARD.items()
+})
+
+# Fretboard as a dense (string, fret) -> semitone array, frets 0-12
+FRETBOARD_SEMITONES = ((np.array([NOTE_TO_SEMITONE[n] for n in OPEN_STRING_NOTES])[:, None]
+                        + np.arange(13)) % 12).astype(np.int8)
+FRETBOARD_SEMITONES.flags.writeable = False
+
+# And its inverse, (string, semitone) -> fret; frets 0-11 of each string hold
+# every semitone exactly once, so argsort inverts the permutation
+FRETBOARD_MATRIX = np.argsort(FRETBOARD_SEMITONES[:, :12], axis=1).astype(np.int8)
+FRETBOARD_MATRIX.flags.writeable = False
+
+# Every position of each note as parallel (string index, fret) arrays; each
+# note occurs exactly once per string within the first 12 frets
+def _note_positions(semitone):
+    """Build the read-only (string index, fret) arrays for one note."""
+    strings = np.arange(len(STRINGS), dtype=np.int8)
+    frets = FRETBOARD_MATRIX[:, semitone].copy()
+    strings.flags.writeable = False
+    frets.flags.writeable = False
+    return strings, frets
+
+NOTE_POSITIONS = MappingProxyType({
+    note: _note_positions(semi) for semi, note in enumerate(NOTES)
+})
 
 # Audio processing constants
 VOLUME_THRESHOLD = 0.02
 MAGNITUDE_THRESHOLD = 0.1
-REQUIRED_STABLE_FRAMES = 3
-SAMPLE_RATE = 22050
-BLOCK_SIZE = int(0.5 * SAMPLE_RATE)  # 0.5 seconds per block
-
-# UI constants
-WINDOW_TITLE = "FretFlow - Fretboard Trainer"
-WINDOW_SIZE = "900x700"
-PADDING = "10"
-
-# Colors
-COLORS = {
-    'background': '#2b3e50',
-    'text': 'white',
-    'text_secondary': '#adb5bd',
-    'fret': '#495057',
-    'marker': '#495057',
-    'root_note': '#28a745',
-    'root_note_outline': '#1e7e34',
-    'third_note': '#17a2b8',
-    'third_note_outline': '#138496',
-    'fifth_note': '#ffc107',
-    'fifth_note_outline': '#d39e00',
+# Audio is captured as int16; the volume threshold scaled to int16 sample
+# units gates the raw input without converting it to float first
+INT16_FULL_SCALE = 32768
+VOLUME_THRESHOLD_I16 = int(VOLUME_THRESHOLD * INT16_FULL_SCALE)
+PITCH_FMIN = 50.0  # Lowest pitch searched for (about G1)
+PITCH_FMAX = 1000.0  # Highest pitch searched for (about B5)
+YIN_THRESHOLD = 0.1  # Max normalized difference accepted as a periodic dip
+REQUIRED_STABLE_FRAMES = 3  # Consecutive capture blocks that must agree
+# The volume gates are defined in seconds so they don't depend on block size
+VOLUME_CHANGE_SPAN = 0.1  # Compare each block's volume with the volume this long ago
+SILENCE_RESET_TIME = 0.2  # Silence that clears the detected-note history
+# The last REQUIRED_STABLE_FRAMES detected notes are packed one byte each
+# (semitone, C = 0) into an int; the note is stable once every byte matches
+STABLE_HISTORY_MASK = (1 << (8 * REQUIRED_STABLE_FRAMES)) - 1
+STABLE_HISTORY_EMPTY = STABLE_HISTORY_MASK  # All bytes 0xFF: nothing heard yet
+STABLE_BYTE_REPEAT = STABLE_HISTORY_MASK // 0xFF  # 0x010101 for 3 frames
+# Guitar fundamentals stay below PITCH_FMAX, so 8 kHz keeps them well under
+# Nyquist; devices that refuse it are captured at the fallback rate instead
+SAMPLE_RATE = 8000
+FALLBACK_SAMPLE_RATE = 22050
+
+# Audio is captured in small blocks (~46 ms) for responsive feedback, while
+# pitch detection runs on a sliding window of the most recent samples
+# (~0.26 s). Both sizes are in samples at SAMPLE_RATE.
+CAPTURE_BLOCK_SIZE = 368
+ANALYSIS_WINDOW = 2048
+AUDIO_RING_SLOTS = 8  # Capture blocks buffered between the audio callback and the detector
+
+# Frequency -> note index (into NOTES) lookup table covering the whole pitch
+# search band and up, at 0.1 Hz resolution; each entry is the note nearest to
+# its bin's centre
+PITCH_LUT_FMIN = PITCH_FMIN
+PITCH_LUT_FMAX = 1400.0
+PITCH_LUT_STEP = 0.1
+_lut_freqs = PITCH_LUT_FMIN + (np.arange(
+    int((PITCH_LUT_FMAX - PITCH_LUT_FMIN) / PITCH_LUT_STEP)) + 0.5) * PITCH_LUT_STEP
+PITCH_LUT = ((np.round(12 * np.log2(_lut_freqs / A4_FREQUENCY)).astype(int) + 9) % 12).astype(np.int8)
+PITCH_LUT.flags.writeable = False
+del _lut_freqs
+
+# UI constants (Tk-only; built on first access by the module __getattr__ below)
+def _build_colors():
+    """Build the color palette used by the UI (interned '#rrggbb' strings)."""
+    colors = {
+        'background': '#2b3e50',
+        'text': '#ffffff',
+        'text_secondary': '#adb5bd',
+        'fret': '#495057',
+        'marker': '#495057',
+        'root_note': '#28a745',
+        'root_note_outline': '#1e7e34',
+        'third_note': '#17a2b8',
+        'third_note_outline': '#138496',
+        'fifth_note': '#ffc107',
+        'fifth_note_outline': '#d39e00',
+    }
+    return {name: sys.intern(value) for name, value in colors.items()}
+
+def _build_colors_rgb():
+    """Build the color palette as packed 0xRRGGBB integers."""
+    return {name: int(value[1:], 16) for name, value in sys.modules[__name__].COLORS.items()}
+
+def _build_fonts():
+    """Build the font table used by the UI."""
+    return {
+        'default': ('Segoe UI', 12),
+        'title': ('Segoe UI', 32, 'bold'),
+        'info': ('Segoe UI', 14),
+        'prompt': ('Segoe UI', 24, 'bold'),
+        'status': ('Segoe UI', 10),
+        'fretboard_label': ('Segoe UI', 8),
+        'fretboard_note': ('Segoe UI', 10, 'bold'),
+    }
+
+def _build_font_objects():
+    """Build a named Tk font for each FONTS entry.
+
+    Tk resolves a named font once; widgets that pass the font object
+    instead of the tuple skip re-parsing it on every item they create.
+    Requires the Tk root window to exist.
+    """
+    import tkinter.font as tkfont
+    return {name: tkfont.Font(font=spec)
+            for name, spec in sys.modules[__name__].FONTS.items()}
+
+_LAZY_CONSTANTS = {
+    'WINDOW_TITLE': lambda: "FretFlow - Fretboard Trainer",
+    'WINDOW_SIZE': lambda: "900x700",
+    'PADDING': lambda: "10",
+    'COLORS': _build_colors,
+    'COLORS_RGB': _build_colors_rgb,
+    'FONTS': _build_fonts,
+    'FONTS_OBJ': _build_font_objects,
 }
 
-# Fonts
-FONTS = {
-    'default': ('Segoe UI', 12),
-    'title': ('Segoe UI', 32, 'bold'),
-    'info': ('Segoe UI', 14),
-    'prompt': ('Segoe UI', 24, 'bold'),
-    'status': ('Segoe UI', 10),
-} 
\ No newline at end of file
+def __getattr__(name):
+    """Build UI constants on first access so headless imports skip them.
+
+    The built value is cached in the module globals, so later lookups
+    (including ``from config import COLORS``) never reach this hook again.
+    """
+    try:
+        builder = _LAZY_CONSTANTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = builder()
+    return value
@@ -9,140 +9,70 @@ This program is licensed under the MIT License. See the LICENSE file for details
 """
 
 import tkinter as tk
+import math
+from collections import deque
 import random
 import time
 import threading
 import numpy as np
 import sounddevice as sd
-import librosa
-import queue
 from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from config import (
     WINDOW_TITLE, WINDOW_SIZE, PADDING, COLORS, FONTS,
-    NATURAL_NOTES, FRETBOARD, VOLUME_THRESHOLD,
-    MAGNITUDE_THRESHOLD, REQUIRED_STABLE_FRAMES
+    NOTES, NATURAL_NOTES, NOTE_TO_SEMITONE, FRETBOARD, FRETBOARD_MATRIX, STRING_INDEX,
+    INT16_FULL_SCALE, VOLUME_THRESHOLD_I16, VOLUME_CHANGE_SPAN, SILENCE_RESET_TIME,
+    STABLE_HISTORY_MASK, STABLE_HISTORY_EMPTY, STABLE_BYTE_REPEAT,
+    SAMPLE_RATE, FALLBACK_SAMPLE_RATE, CAPTURE_BLOCK_SIZE, ANALYSIS_WINDOW, AUDIO_RING_SLOTS
 )
-from music_theory import MusicTheory
+from music_theory import MusicTheory, detect_pitch_yin, freq_to_note_name
 from ui_components import VolumeIndicator
 import os
 
-# Map of string names to natural notes and their fret locations
-NATURAL_NOTES = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
-FRETBOARD = {
-    'E': {  # Low E string
-        'E': 0,
-        'F': 1,
-        'F#': 2,
-        'G': 3,
-        'G#': 4,
-        'A': 5,
-        'A#': 6,
-        'B': 7,
-        'C': 8,
-        'C#': 9,
-        'D': 10,
-        'D#': 11,
-    },
-    'A': {
-        'A': 0,
-        'A#': 1,
-        'B': 2,
-        'C': 3,
-        'C#': 4,
-        'D': 5,
-        'D#': 6,
-        'E': 7,
-        'F': 8,
-        'F#': 9,
-        'G': 10,
-        'G#': 11,
-    },
-    'D': {
-        'D': 0,
-        'D#': 1,
-        'E': 2,
-        'F': 3,
-        'F#': 4,
-        'G': 5,
-        'G#': 6,
-        'A': 7,
-        'A#': 8,
-        'B': 9,
-        'C': 10,
-        'C#': 11,
-    },
-    'G': {
-        'G': 0,
-        'G#': 1,
-        'A': 2,
-        'A#': 3,
-        'B': 4,
-        'C': 5,
-        'C#': 6,
-        'D': 7,
-        'D#': 8,
-        'E': 9,
-        'F': 10,
-        'F#': 11,
-    },
-    'B': {
-        'B': 0,
-        'C': 1,
-        'C#': 2,
-        'D': 3,
-        'D#': 4,
-        'E': 5,
-        'F': 6,
-        'F#': 7,
-        'G': 8,
-        'G#': 9,
-        'A': 10,
-        'A#': 11,
-    },
-    'e': {  # High E string
-        'E': 0,
-        'F': 1,
-        'F#': 2,
-        'G': 3,
-        'G#': 4,
-        'A': 5,
-        'A#': 6,
-        'B': 7,
-        'C': 8,
-        'C#': 9,
-        'D': 10,
-        'D#': 11,
-    }
-}
+# Drawing row of each string, top to bottom (so low E is at the bottom)
+STRING_POSITIONS = {'e': 0, 'B': 1, 'G': 2, 'D': 3, 'A': 4, 'E': 5}
+STRING_ROWS = tuple(STRING_POSITIONS)
 
 class FretboardDiagram(ttk.Frame):
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         
+        # Named fonts need the Tk root, so resolve them here rather than at import
+        from config import FONTS_OBJ
+        self.label_font = FONTS_OBJ['fretboard_label']
+        self.note_font = FONTS_OBJ['fretboard_note']
+        
         # Create canvas with minimum size and pack configuration
-        self.canvas = tk.Canvas(self, height=180, width=600, bg='#2b3e50')  # Increased height
+        self.canvas = tk.Canvas(self, height=180, width=600, bg=COLORS['background'])  # Increased height
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=10)
         
+        # Size the static layer was last drawn for, what the note layer currently
+        # shows (so identical redraws are skipped), and any pending resize redraw
+        self._static_size = None
+        self._notes_key = None
+        self._resize_job = None
+        
         # Bind resize event to redraw
         self.canvas.bind('<Configure>', self._on_resize)
         self.draw_empty_fretboard()  # Draw initial empty fretboard
     
     def _on_resize(self, event):
+        # Coalesce the burst of <Configure> events from a drag into one redraw
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(50, self._redraw)
+    
+    def _redraw(self):
+        self._resize_job = None
         if hasattr(self, 'last_root_note') and hasattr(self, 'last_root_string'):
             self.draw_fretboard(self.last_root_note, self.last_root_string)
         else:
             self.draw_empty_fretboard()
     
-    def draw_empty_fretboard(self, show_all_notes=False):
-        """Draw the fretboard without any notes"""
-        self.canvas.delete('all')
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-        
-        # Draw strings (reversed order so low E is at bottom)
-        string_positions = {'e': 0, 'B': 1, 'G': 2, 'D': 3, 'A': 4, 'E': 5}
+    def _draw_static(self, width, height):
+        """Draw the frets, strings, markers and labels (tagged 'static')"""
+        string_positions = STRING_POSITIONS
         string_spacing = (height - 40) / 6  # Reduced height to leave room for circles
         fret_spacing = (width - 45) / 13  # Increased left margin for circles
         fret_start_x = 45  # Increased start position to accommodate circles
@@ -154,12 +84,12 @@ class FretboardDiagram(ttk.Frame):
         for string, pos in string_positions.items():
             y = start_y + (pos + 0.5) * string_spacing
             # Add string names to the left of the fretboard
-            self.canvas.create_text(20, y, text=string, fill='#adb5bd', 
-                                  font=('Segoe UI', 8))
+            self.canvas.create_text(20, y, text=string, fill=COLORS['text_secondary'], 
+                                  font=self.label_font, tags='static')
         
         # Draw fret markers first (so they appear behind the strings and frets)
         marker_positions = [3, 5, 7, 9, 12]  # Traditional fret marker positions
-        marker_color = '#495057'  # Subtle gray color for markers
+        marker_color = COLORS['marker']  # Subtle gray color for markers
         marker_size = 6  # Size of the marker dots
         
         for fret in marker_positions:
@@ -169,142 +99,136 @@ class FretboardDiagram(ttk.Frame):
                 y2 = start_y + (4.5 * string_spacing)  # Position between 4th and 5th strings
                 self.canvas.create_oval(x-marker_size, y1-marker_size, 
                                      x+marker_size, y1+marker_size, 
-                                     fill=marker_color, outline=marker_color)
+                                     fill=marker_color, outline=marker_color, tags='static')
                 self.canvas.create_oval(x-marker_size, y2-marker_size, 
                                      x+marker_size, y2+marker_size, 
-                                     fill=marker_color, outline=marker_color)
+                                     fill=marker_color, outline=marker_color, tags='static')
             else:  # Single dot for other positions
                 y = start_y + (3 * string_spacing)  # Center between strings
                 self.canvas.create_oval(x-marker_size, y-marker_size, 
                                      x+marker_size, y+marker_size, 
-                                     fill=marker_color, outline=marker_color)
+                                     fill=marker_color, outline=marker_color, tags='static')
         
         # Draw frets
         for i in range(13):
             x = fret_start_x + (i * fret_spacing)
             self.canvas.create_line(x, start_y, x, start_y + 6 * string_spacing, 
-                                  fill='#495057')  # Lighter gray for frets
+                                  fill=COLORS['fret'], tags='static')  # Lighter gray for frets
             
             # Add fret numbers
             if i > 0:  # Don't show 0 for the nut
                 self.canvas.create_text(x - fret_spacing/2, height - 15, 
-                                      text=str(i), fill='#adb5bd', font=('Segoe UI', 8))
+                                      text=str(i), fill=COLORS['text_secondary'], font=self.label_font,
+                                      tags='static')
         
         # Draw strings
         for string, pos in string_positions.items():
             y = start_y + (pos + 0.5) * string_spacing
-            self.canvas.create_line(fret_start_x, y, width - 20, y, fill='#adb5bd')  # Lighter gray for strings
-            
-            # If show_all_notes is enabled, draw all notes for this string
-            if show_all_notes:
+            self.canvas.create_line(fret_start_x, y, width - 20, y, fill=COLORS['text_secondary'],
+                                  tags='static')  # Lighter gray for strings
+    
+    def draw_empty_fretboard(self, show_all_notes=False):
+        """Draw the fretboard without any notes"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        key = (width, height, show_all_notes)
+        if key == self._notes_key:
+            return
+        self._notes_key = key
+        
+        # Note overlays are redrawn; the static layer only when the size changes
+        self.canvas.delete('notes')
+        if (width, height) != self._static_size:
+            self.canvas.delete('static')
+            self._draw_static(width, height)
+            self._static_size = (width, height)
+        
+        # If show_all_notes is enabled, draw all notes on every string
+        if show_all_notes:
+            string_spacing = (height - 40) / 6
+            fret_spacing = (width - 45) / 13
+            fret_start_x = 45
+            start_y = 20
+            for string, pos in STRING_POSITIONS.items():
+                y = start_y + (pos + 0.5) * string_spacing
                 for note, fret in FRETBOARD[string].items():
                     x = fret_start_x + (fret - 0.5) * fret_spacing
                     # Draw a smaller, more subtle circle for reference notes
                     self.canvas.create_oval(x-8, y-8, x+8, y+8,
-                                         fill='#495057', outline='#343a40')
+                                         fill=COLORS['fret'], outline='#343a40', tags='notes')
                     self.canvas.create_text(x, y, text=note,
-                                         fill='#adb5bd', font=('Segoe UI', 8))
+                                         fill=COLORS['text_secondary'], font=self.label_font,
+                                         tags='notes')
 
     def draw_fretboard(self, root_note, root_string, show_all_notes=False, show_target=True):
         self.last_root_note = root_note
         self.last_root_string = root_string
         
+        # Nothing to do if the canvas already shows this exact diagram
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        key = (width, height, root_note, root_string, show_all_notes, show_target)
+        if key == self._notes_key:
+            return
+        
         # Draw the basic fretboard first
         self.draw_empty_fretboard(show_all_notes)
+        self._notes_key = key
         
         # If we're showing all notes or not showing target, return here
         if show_all_notes or not show_target:
             return
         
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-        string_positions = {'e': 0, 'B': 1, 'G': 2, 'D': 3, 'A': 4, 'E': 5}  # Reversed order
+        string_positions = STRING_POSITIONS
         string_spacing = (height - 40) / 6  # Reduced height to leave room for circles
         fret_spacing = (width - 45) / 13  # Increased left margin for circles
         fret_start_x = 45  # Increased start position to accommodate circles
         start_y = 20  # Padding at top
         
-        # Convert note names to semitones (C = 0)
-        NOTE_TO_SEMITONE = {
-            'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4, 'F': 5, 
-            'F#': 6, 'G': 7, 'G#': 8, 'A': 9, 'A#': 10, 'B': 11
-        }
-        SEMITONE_TO_NOTE = {v: k for k, v in NOTE_TO_SEMITONE.items()}
-        
         # Calculate intervals
-        root_semitone = NOTE_TO_SEMITONE[root_note]
-        major_third_semitone = (root_semitone + 4) % 12
-        perfect_fifth_semitone = (root_semitone + 7) % 12
-        
-        major_third = SEMITONE_TO_NOTE[major_third_semitone]
-        perfect_fifth = SEMITONE_TO_NOTE[perfect_fifth_semitone]
+        major_third, perfect_fifth = MusicTheory.calculate_intervals(root_note)
         
         # Get the root note position
         root_string_pos = string_positions[root_string]
-        root_fret = FRETBOARD[root_string][root_note]
+        root_fret = int(FRETBOARD_MATRIX[STRING_INDEX[root_string], NOTE_TO_SEMITONE[root_note]])
         
         # Draw the root note
         root_y = start_y + (root_string_pos + 0.5) * string_spacing
         root_x = fret_start_x + (root_fret - 0.5) * fret_spacing  # Adjusted to center between frets
         self.canvas.create_oval(root_x-12, root_y-12, root_x+12, root_y+12, 
-                              fill='#28a745', outline='#1e7e34')
+                              fill=COLORS['root_note'], outline=COLORS['root_note_outline'], tags='notes')
         self.canvas.create_text(root_x, root_y, text=root_note, 
-                              fill='white', font=('Segoe UI', 10, 'bold'))
+                              fill=COLORS['text'], font=self.note_font, tags='notes')
         
         # Function to find the best position for an interval on adjacent strings
         def find_interval_position(interval_note, string):
-            # Find all occurrences of the interval note on this string
-            interval_positions = []
-            for note, fret in FRETBOARD[string].items():
-                if NOTE_TO_SEMITONE[note] == NOTE_TO_SEMITONE[interval_note]:
-                    interval_positions.append(fret)
-            
-            if not interval_positions:
-                return None
-            
-            # Find the position closest to the root note
-            best_fret = min(interval_positions, key=lambda f: abs(f - root_fret))
-            
-            # If the best position is too far, try octave adjustments
-            if abs(best_fret - root_fret) > 4:
-                if best_fret > root_fret and best_fret - 12 >= 0:
-                    best_fret -= 12
-                elif best_fret < root_fret and best_fret + 12 <= 12:
-                    best_fret += 12
-            
+            best_fret = MusicTheory.find_best_position(interval_note, string, root_fret)
             y = start_y + (string_positions[string] + 0.5) * string_spacing
             x = fret_start_x + (best_fret - 0.5) * fret_spacing
             return (best_fret, x, y)
         
         # Get adjacent strings
-        all_strings = list(string_positions.keys())
-        root_index = all_strings.index(root_string)
-        
         possible_strings = []
-        if root_index > 0:
-            possible_strings.append(all_strings[root_index - 1])
-        if root_index < len(all_strings) - 1:
-            possible_strings.append(all_strings[root_index + 1])
+        if root_string_pos > 0:
+            possible_strings.append(STRING_ROWS[root_string_pos - 1])
+        if root_string_pos < len(STRING_ROWS) - 1:
+            possible_strings.append(STRING_ROWS[root_string_pos + 1])
         
         # Draw intervals on adjacent strings
         for string in possible_strings:
-            # Try to find major third
-            third_pos = find_interval_position(major_third, string)
-            if third_pos:
-                fret, x, y = third_pos
-                self.canvas.create_oval(x-12, y-12, x+12, y+12, 
-                                     fill='#17a2b8', outline='#138496')
-                self.canvas.create_text(x, y, text="3", 
-                                     fill='white', font=('Segoe UI', 10, 'bold'))
+            # Major third
+            fret, x, y = find_interval_position(major_third, string)
+            self.canvas.create_oval(x-12, y-12, x+12, y+12, 
+                                 fill=COLORS['third_note'], outline=COLORS['third_note_outline'], tags='notes')
+            self.canvas.create_text(x, y, text="3", 
+                                 fill=COLORS['text'], font=self.note_font, tags='notes')
             
-            # Try to find perfect fifth
-            fifth_pos = find_interval_position(perfect_fifth, string)
-            if fifth_pos:
-                fret, x, y = fifth_pos
-                self.canvas.create_oval(x-12, y-12, x+12, y+12, 
-                                     fill='#ffc107', outline='#d39e00')
-                self.canvas.create_text(x, y, text="5", 
-                                     fill='black', font=('Segoe UI', 10, 'bold'))
+            # Perfect fifth
+            fret, x, y = find_interval_position(perfect_fifth, string)
+            self.canvas.create_oval(x-12, y-12, x+12, y+12, 
+                                 fill=COLORS['fifth_note'], outline=COLORS['fifth_note_outline'], tags='notes')
+            self.canvas.create_text(x, y, text="5", 
+                                 fill='black', font=self.note_font, tags='notes')
 
 class FretTrainer:
     def __init__(self, master):
@@ -482,11 +406,45 @@ class FretTrainer:
         self.last_successful_note = None
         self.last_successful_string = None
         self.start_time = None
-        self.audio_queue = queue.Queue()
-        self.volume_threshold = VOLUME_THRESHOLD
-        self.magnitude_threshold = MAGNITUDE_THRESHOLD
-        self.stable_note_counter = 0
-        self.required_stable_frames = REQUIRED_STABLE_FRAMES
+        
+        # Capture at SAMPLE_RATE if the device allows it; otherwise fall back and
+        # scale the block and window so they keep the same duration
+        try:
+            sd.check_input_settings(channels=1, samplerate=SAMPLE_RATE, dtype='int16')
+            self._samplerate = SAMPLE_RATE
+        except sd.PortAudioError:
+            self._samplerate = FALLBACK_SAMPLE_RATE
+        scale = self._samplerate / SAMPLE_RATE
+        self._blocksize = round(CAPTURE_BLOCK_SIZE * scale)
+        self._window_size = round(ANALYSIS_WINDOW * scale)
+        
+        # Preallocated ring of capture blocks filled by the audio callback;
+        # the indices only ever grow and are taken modulo AUDIO_RING_SLOTS
+        self._ring = np.zeros((AUDIO_RING_SLOTS, self._blocksize), dtype=np.int16)
+        self._write_index = 0
+        self._read_index = 0
+        self._data_ready = threading.Event()  # Set by the callback after each block
+        self.volume_threshold = VOLUME_THRESHOLD_I16  # RMS in int16 sample units
+
+        # One input stream and one detector thread live for the whole app;
+        # each prompt only sets _active, and a match clears it again. _stop
+        # ends the detector when the window is closed
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._stream = sd.InputStream(callback=self._audio_callback, channels=1, samplerate=self._samplerate,
+                                      blocksize=self._blocksize, dtype='int16', latency='low')
+        self._stream.start()
+        self._listener = threading.Thread(target=self.listen_for_note, daemon=True)
+        self._listener.start()
+        master.protocol("WM_DELETE_WINDOW", self.close)
+
+    def close(self):
+        """Stop the detector thread and the input stream, then close the window"""
+        self._stop.set()
+        self._active.clear()
+        self._listener.join(timeout=0.5)
+        self._stream.close()
+        self.master.destroy()
 
     def toggle_show_notes(self):
         """Toggle the display of all notes on the fretboard"""
@@ -512,7 +470,8 @@ class FretTrainer:
             return
             
         # Get the fret position of the current note
-        fret = FRETBOARD[self.current_string][self.current_note]
+        fret = FRETBOARD_MATRIX[STRING_INDEX[self.current_string],
+                                NOTE_TO_SEMITONE[self.current_note]]
         
         # Create hint message
         hint_message = f"Hint: {self.current_note} on the {self.current_string} string is at fret {fret}"
@@ -532,7 +491,6 @@ class FretTrainer:
     def next_prompt(self):
         # Clear the result text but keep the fretboard display from the previous note
         self.result_label.config(text="")
-        self.stable_note_counter = 0
         self.hint_button.configure(state='normal')  # Enable hint button for new prompt
 
         enabled_strings = [s for s, v in self.selected_strings.items() if v.get()]
@@ -548,10 +506,16 @@ class FretTrainer:
         if self.difficulty_var.get() == "Natural Notes Only":
             available_notes = NATURAL_NOTES
         else:
-            available_notes = list(FRETBOARD[self.current_string].keys())
-
-        new_note = random.choice(available_notes)
-        while new_note == self.previous_note:
+            available_notes = NOTES  # Every note occurs on every string
+
+        # Pick uniformly among the notes other than the previous one: draw from
+        # one fewer slot and step over the previous note's index
+        if self.previous_note in available_notes:
+            index = random.randrange(len(available_notes) - 1)
+            if index >= available_notes.index(self.previous_note):
+                index += 1
+            new_note = available_notes[index]
+        else:
             new_note = random.choice(available_notes)
         self.current_note = new_note
         self.previous_note = new_note
@@ -561,103 +525,105 @@ class FretTrainer:
         self.start_time = time.time()
         
         # Start listening for the new note
-        threading.Thread(target=self.listen_for_note, daemon=True).start()
-
-    def listen_for_note(self):
-        duration = 0.1  # Back to 0.1 seconds for better responsiveness
-        samplerate = 22050
-        blocksize = int(duration * samplerate)
+        self._active.set()
 
-        def callback(indata, frames, time_info, status):
-            volume = np.sqrt(np.mean(indata**2))
-            self.audio_queue.put((indata.copy(), volume))
+    def _audio_callback(self, indata, frames, time_info, status):
+        # Runs on the realtime audio thread: copy into the next slot, nothing else
+        np.copyto(self._ring[self._write_index % AUDIO_RING_SLOTS], indata[:, 0])
+        self._write_index += 1
+        self._data_ready.set()
 
-        with sd.InputStream(callback=callback, channels=1, samplerate=samplerate, blocksize=blocksize):
-            last_note = None
-            last_volume = 0
+    def listen_for_note(self):
+        samplerate = self._samplerate
+        blocksize = self._blocksize
+        # Sliding window of the most recent samples used for pitch detection. It
+        # holds the raw int16 values; YIN is scale invariant, so no rescaling
+        window = np.zeros(self._window_size, dtype=np.float32)
+        # Block widened to int64 so its sum of squares cannot overflow
+        wide = np.zeros(blocksize, dtype=np.int64)
+        # The silence gate compares sums of squares directly, with no sqrt
+        loud_ssq = self.volume_threshold ** 2 * blocksize
+        # Block counts for the time-based gates at this block size and rate
+        change_span_blocks = math.ceil(VOLUME_CHANGE_SPAN * samplerate / blocksize)
+        required_silence_frames = math.ceil(SILENCE_RESET_TIME * samplerate / blocksize)
+
+        while not self._stop.is_set():
+            # Idle until next_prompt sets a new target note
+            if not self._active.wait(timeout=0.1):
+                continue
+
+            # Packed history of recently detected notes and the value it takes
+            # once the target note has filled every slot
+            stable_pattern = NOTE_TO_SEMITONE[self.current_note] * STABLE_BYTE_REPEAT
+            history = STABLE_HISTORY_EMPTY
+            # Volumes of the last change_span_blocks blocks, oldest first
+            recent_volumes = deque([0.0] * change_span_blocks, maxlen=change_span_blocks)
             consecutive_silence = 0
-            required_silence_frames = 2  # Back to 2 for quicker recovery
-            
-            while True:
-                if not self.audio_queue.empty():
-                    audio, volume = self.audio_queue.get()
-                    self.master.after(0, self.update_volume_bar, volume)
+            window.fill(0)
+            self._read_index = self._write_index
+
+            while self._active.is_set():
+                # Sleep until the callback delivers a block, then drain the ring.
+                # The timeout lets a cleared _active stop the loop even if the
+                # stream stalls and no block ever arrives
+                if not self._data_ready.wait(timeout=0.05):
+                    continue
+                self._data_ready.clear()
+                while self._read_index != self._write_index and self._active.is_set():
+                    # If the callback has lapped us, skip to the oldest block still intact
+                    self._read_index = max(self._read_index, self._write_index - AUDIO_RING_SLOTS + 1)
+                    audio = self._ring[self._read_index % AUDIO_RING_SLOTS]
+                    self._read_index += 1
+                    np.copyto(wide, audio)
+                    ssq = int(np.dot(wide, wide))
+                    loud = ssq >= loud_ssq
+                    volume = math.sqrt(ssq / blocksize)  # RMS, for the meter and change gate
+                    self.master.after(0, self.update_volume_bar, volume / INT16_FULL_SCALE)
+                    
+                    # Shift the new block into the analysis window
+                    window[:-blocksize] = window[blocksize:]
+                    window[-blocksize:] = audio
                     
-                    # Check for significant volume change
-                    volume_change = abs(volume - last_volume)
-                    last_volume = volume
+                    # Check for significant volume change over the last VOLUME_CHANGE_SPAN
+                    volume_change = abs(volume - recent_volumes[0])
+                    recent_volumes.append(volume)
                     
                     # If volume is too low, increment silence counter
-                    if volume < self.volume_threshold:
+                    if not loud:
                         consecutive_silence += 1
                         if consecutive_silence >= required_silence_frames:
-                            self.stable_note_counter = 0
-                            last_note = None
+                            history = STABLE_HISTORY_EMPTY
                     else:
                         consecutive_silence = 0
                     
                     # Only process audio if volume is above threshold and there's a significant change
-                    if volume >= self.volume_threshold and volume_change > self.volume_threshold * 0.15:  # Back to 0.15 for better sensitivity
-                        audio = audio.flatten()
-                        frequency = self.detect_pitch(audio, samplerate)
-                        note = self.freq_to_note_name(frequency)
+                    if loud and volume_change > self.volume_threshold * 0.15:  # Back to 0.15 for better sensitivity
+                        frequency = self.detect_pitch(window, samplerate)
+                        note = freq_to_note_name(frequency)
                         
                         if note:
+                            # Push the note into the history, dropping the oldest entry
+                            history = ((history << 8) | NOTE_TO_SEMITONE[note]) & STABLE_HISTORY_MASK
+                            
                             if note == self.current_note:
-                                if last_note == note:
-                                    self.stable_note_counter += 1
-                                else:
-                                    self.stable_note_counter = 1
-                                last_note = note
-
-                                if self.stable_note_counter >= self.required_stable_frames:
+                                if history == stable_pattern:
+                                    self._active.clear()
                                     elapsed = time.time() - self.start_time
-                                    self.master.after(0, lambda: self.display_result(True, elapsed))
-                                    break
-                            elif note:
-                                # Reset counter if wrong note is detected
-                                self.stable_note_counter = 0
-                                self.master.after(0, lambda: self.result_label.configure(
-                                    text=f"Heard: {note} ❌", 
-                                    style="Error.TLabel"
-                                ))
+                                    self.master.after(0, self.display_result, True, elapsed)
+                            else:
+                                self.master.after(0, self.report_wrong_note, note)
 
     def update_volume_bar(self, volume):
         """Update the volume indicator with the current volume level."""
         self.volume_indicator.update(volume)
 
+    def report_wrong_note(self, note):
+        """Show the note that was heard instead of the target."""
+        self.result_label.configure(text=f"Heard: {note} ❌", style="Error.TLabel")
+
     def detect_pitch(self, y, sr):
         try:
-            # Use a more robust pitch detection algorithm with adjusted parameters
-            pitches, magnitudes = librosa.piptrack(
-                y=y, 
-                sr=sr,
-                hop_length=32,  # Reduced from 64 for maximum responsiveness
-                fmin=50,  # Minimum frequency (about G1)
-                fmax=1000,  # Maximum frequency (about B5)
-                threshold=0.05  # Keep this low for sensitivity
-            )
-            
-            # Get the maximum magnitude and its corresponding pitch
-            index = magnitudes.argmax()
-            pitch = pitches[index // pitches.shape[1], index % pitches.shape[1]]
-            mag = magnitudes[index // magnitudes.shape[1], index % magnitudes.shape[1]]
-            
-            # Only return pitch if magnitude is above threshold
-            if pitch == 0 or mag < self.magnitude_threshold:
-                return 0
-                
-            # Apply a simple moving average to smooth pitch detection
-            if hasattr(self, '_last_pitches'):
-                self._last_pitches.append(pitch)
-                if len(self._last_pitches) > 2:  # Keep at 2 for minimal smoothing
-                    self._last_pitches.pop(0)
-                pitch = sum(self._last_pitches) / len(self._last_pitches)
-            else:
-                self._last_pitches = [pitch]
-                
-            return pitch
-            
+            return detect_pitch_yin(y, sr)
         except Exception as e:
             print(f"Pitch detection error: {e}")
             return 0
@@ -689,14 +655,6 @@ class FretTrainer:
             # Schedule the next prompt after a short delay
             self.master.after(1000, self.next_prompt)
 
-    def freq_to_note_name(self, freq):
-        if freq <= 0: return None
-        A4 = 440
-        NOTES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        n = int(round(12 * np.log2(freq / A4)))
-        note_index = (n + 9) % 12  # Shift so A=0
-        return NOTES[note_index] if 0 <= note_index < len(NOTES) else None
-
 if __name__ == "__main__":
     # Create the main window with ttkbootstrap
     root = ttk.Window(themename="darkly")
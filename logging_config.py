@@ -1,12 +1,24 @@
 """Logging configuration for the Fretboard Trainer application."""
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
+
+# Handler installed on the root logger, and the background listener that
+# writes its queued records to the real handlers
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Setup logging configuration for the application.
     
+    Loggers only enqueue records; a background listener thread does the file
+    and console I/O, so logging from the audio or UI threads never blocks.
+    
     Args:
         log_level: The logging level to use (default: "INFO")
     """
@@ -30,11 +42,35 @@ def setup_logging(log_level: str = "INFO") -> None:
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(log_format)
     
+    # Route records through a queue to the file and console handlers
+    global _queue_handler, _listener
+    stop_logging()
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, file_handler, console_handler)
+    _listener.start()
+    _queue_handler = QueueHandler(log_queue)
+    
     # Setup root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(_queue_handler)
     
     # Log startup message
-    logging.info("Fretboard Trainer application started") 
\ No newline at end of file
+    logging.info("Fretboard Trainer application started") 
+
+def stop_logging() -> None:
+    """Detach the queue handler, flush queued records and stop the listener.
+    
+    Safe to call more than once; also registered to run at exit.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(stop_logging)
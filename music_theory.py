@@ -1,34 +1,175 @@
 """Music theory calculations and utilities for the Fretboard Trainer."""
 
+import math
 import numpy as np
-import librosa
+from functools import lru_cache
 from typing import Optional, Tuple, List
 from config import (
-    NOTES, NOTE_TO_SEMITONE, SEMITONE_TO_NOTE,
-    A4_FREQUENCY, MAGNITUDE_THRESHOLD
+    NOTES, NOTE_TO_SEMITONE, SEMITONE_TO_NOTE, STRINGS, STRING_INDEX,
+    FRETBOARD_MATRIX, NOTE_POSITIONS, SEMITONE_FRETS,
+    A4_FREQUENCY, MAGNITUDE_THRESHOLD,
+    PITCH_FMIN, PITCH_FMAX, YIN_THRESHOLD,
+    PITCH_LUT, PITCH_LUT_FMIN, PITCH_LUT_STEP
 )
 
+# (major third, perfect fifth) for every root note
+_INTERVALS = {
+    root: (SEMITONE_TO_NOTE[(semitone + 4) % 12], SEMITONE_TO_NOTE[(semitone + 7) % 12])
+    for root, semitone in NOTE_TO_SEMITONE.items()
+}
+
+def _next_fast_len(n: int) -> int:
+    """Return the smallest 2**a * 3**b * 5**c that is at least n.
+    
+    NumPy's FFT handles these sizes on its fast radix paths, so padding only
+    up to one of them beats padding to the next power of two.
+    """
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            size = p35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+@lru_cache(maxsize=8)
+def _yin_plan(sr: int, fmin: float, fmax: float, n: int) -> Tuple[int, int, np.ndarray, int]:
+    """Lag range, read-only lag array and FFT size for one YIN configuration."""
+    tau_min = int(sr / fmax)
+    tau_max = int(np.ceil(sr / fmin))
+    lags = np.arange(tau_max + 1, dtype=np.float64)
+    lags.flags.writeable = False
+    # Lags up to tau_max stay free of circular wrap-around with n + tau_max points
+    return tau_min, tau_max, lags, _next_fast_len(n + tau_max)
+
+def detect_pitch_yin(y: np.ndarray, sr: int, fmin: float = PITCH_FMIN,
+                     fmax: float = PITCH_FMAX, threshold: float = YIN_THRESHOLD) -> float:
+    """Estimate the fundamental frequency of a monophonic signal with YIN.
+    
+    The autocorrelation is computed with an FFT, so the whole estimate is
+    O(N log N) in the window length.
+    
+    Args:
+        y: The audio signal (any scale; YIN is amplitude invariant)
+        sr: The sample rate
+        fmin: Lowest pitch to search for, in Hz
+        fmax: Highest pitch to search for, in Hz
+        threshold: Max normalized difference accepted as a periodic dip
+        
+    Returns:
+        The detected frequency in Hz, or 0 if no pitch detected
+    """
+    # float32 halves the bytes the FFT touches; a no-op for the live window
+    y = np.ascontiguousarray(y, dtype=np.float32)
+    tau_min, tau_max, lags, fft_size = _yin_plan(sr, fmin, fmax, len(y))
+    if len(y) < 2 * tau_max:
+        return 0.0
+    
+    # Total energy; the difference function only ever needs it minus the
+    # running energy of the first and last tau samples (tau <= tau_max)
+    total = float(np.dot(y, y))
+    if total <= 0:
+        return 0.0
+    diff = np.empty(tau_max + 1)
+    diff[0] = 0.0
+    np.cumsum(np.square(y[:tau_max], dtype=np.float64), out=diff[1:])
+    tail = np.square(y[:-tau_max - 1:-1], dtype=np.float64)
+    diff[1:] += np.cumsum(tail, out=tail)
+    
+    # Autocorrelation via the FFT (Wiener-Khinchin): r = IFFT(|FFT(y)|^2)
+    spectrum = np.fft.rfft(y, fft_size)
+    spectrum *= spectrum.conj()
+    r = np.fft.irfft(spectrum, fft_size)[:tau_max + 1]
+    
+    # YIN difference function d(tau) = sum((y[j] - y[j + tau])^2)
+    #                                 = 2 * total - head - tail - 2 * r
+    diff += r
+    diff += r
+    np.subtract(2 * total, diff, out=diff)
+    
+    # Cumulative mean normalized difference; the period is the first dip
+    # below the threshold, followed down to its local minimum
+    cmndf = np.empty_like(diff)
+    cmndf[0] = 1.0
+    running = np.cumsum(diff[1:])
+    np.maximum(running, 1e-12, out=running)
+    np.multiply(diff[1:], lags[1:], out=cmndf[1:])
+    cmndf[1:] /= running
+    
+    below = np.flatnonzero(cmndf[tau_min:tau_max] < threshold)
+    if not below.size:
+        return 0.0
+    tau = tau_min + int(below[0])
+    while tau + 1 < tau_max and cmndf[tau + 1] < cmndf[tau]:
+        tau += 1
+    
+    # Refine the lag with a 3-point parabolic interpolation
+    left, mid, right = cmndf[tau - 1], cmndf[tau], cmndf[tau + 1]
+    denom = left - 2 * mid + right
+    lag = tau + (0.5 * (left - right) / denom if denom != 0 else 0.0)
+    return sr / lag
+
+def freq_to_note_name(freq: float) -> Optional[str]:
+    """Convert a frequency to its corresponding note name.
+    
+    Args:
+        freq: The frequency in Hz
+        
+    Returns:
+        The note name (e.g., 'C', 'F#') or None if frequency is invalid
+    """
+    if freq <= 0:
+        return None
+    
+    # Guitar-range pitches come straight from the precomputed table
+    index = int((freq - PITCH_LUT_FMIN) / PITCH_LUT_STEP)
+    if freq >= PITCH_LUT_FMIN and index < len(PITCH_LUT):
+        return NOTES[PITCH_LUT[index]]
+        
+    # Outside the table: scalar math.log2 avoids NumPy's ufunc dispatch
+    n = round(12 * math.log2(freq / A4_FREQUENCY))
+    return NOTES[(n + 9) % 12]  # Shift so A=0
+
+def get_note_positions(note: str, string: str) -> Tuple[int, ...]:
+    """Get all fret positions for a given note on a string.
+    
+    Args:
+        note: The note to find (e.g., 'C', 'F#')
+        string: The string to search on (e.g., 'E', 'A')
+        
+    Returns:
+        Tuple of fret positions where the note appears
+    """
+    return SEMITONE_FRETS[string][NOTE_TO_SEMITONE[note]]
+
 class MusicTheory:
+    # Kept on the class for existing callers
+    freq_to_note_name = staticmethod(freq_to_note_name)
+
     @staticmethod
-    def freq_to_note_name(freq: float) -> Optional[str]:
-        """Convert a frequency to its corresponding note name.
+    def detect_pitch(y: np.ndarray, sr: int) -> float:
+        """Detect the fundamental frequency of an audio signal.
         
         Args:
-            freq: The frequency in Hz
+            y: The audio signal
+            sr: The sample rate
             
         Returns:
-            The note name (e.g., 'C', 'F#') or None if frequency is invalid
+            The detected frequency in Hz, or 0 if no pitch detected
         """
-        if freq <= 0:
-            return None
-            
-        n = int(round(12 * np.log2(freq / A4_FREQUENCY)))
-        note_index = (n + 9) % 12  # Shift so A=0
-        return NOTES[note_index] if 0 <= note_index < len(NOTES) else None
+        return detect_pitch_yin(y, sr)
 
     @staticmethod
-    def detect_pitch(y: np.ndarray, sr: int) -> float:
-        """Detect the fundamental frequency of an audio signal.
+    def detect_pitch_piptrack(y: np.ndarray, sr: int) -> float:
+        """Detect the strongest pitch of an audio signal with librosa's piptrack.
+        
+        Much slower than detect_pitch and only kept for comparison; librosa
+        is an optional dependency, imported on first use.
         
         Args:
             y: The audio signal
@@ -37,16 +178,19 @@ class MusicTheory:
         Returns:
             The detected frequency in Hz, or 0 if no pitch detected
         """
-        try:
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-            index = magnitudes.argmax()
-            pitch = pitches[index // pitches.shape[1], index % pitches.shape[1]]
-            mag = magnitudes[index // pitches.shape[1], index % pitches.shape[1]]
-            if pitch == 0 or mag < MAGNITUDE_THRESHOLD:
-                return 0
-            return pitch
-        except Exception:
-            return 0
+        import librosa
+        
+        # Reject input piptrack can't handle up front; anything else that
+        # raises is a real error and propagates
+        if y.size < 2 or not np.isfinite(y).all():
+            return 0.0
+        
+        # Only track bins within the guitar's pitch band
+        pitches, magnitudes = librosa.piptrack(y=y, sr=sr, fmin=PITCH_FMIN, fmax=PITCH_FMAX)
+        peak = np.unravel_index(magnitudes.argmax(), magnitudes.shape)
+        if magnitudes[peak] < MAGNITUDE_THRESHOLD:
+            return 0.0
+        return float(pitches[peak])
 
     @staticmethod
     def calculate_intervals(root_note: str) -> Tuple[str, str]:
@@ -58,32 +202,26 @@ class MusicTheory:
         Returns:
             Tuple of (major_third, perfect_fifth) note names
         """
-        root_semitone = NOTE_TO_SEMITONE[root_note]
-        major_third_semitone = (root_semitone + 4) % 12
-        perfect_fifth_semitone = (root_semitone + 7) % 12
-        
-        return (
-            SEMITONE_TO_NOTE[major_third_semitone],
-            SEMITONE_TO_NOTE[perfect_fifth_semitone]
-        )
+        return _INTERVALS[root_note]
+
+    # Kept on the class for existing callers
+    get_note_positions = staticmethod(get_note_positions)
 
     @staticmethod
-    def get_note_positions(note: str, string: str) -> List[int]:
-        """Get all fret positions for a given note on a string.
+    def get_fretboard_positions(note: str) -> List[Tuple[str, int]]:
+        """Get every position of a note across all strings.
         
         Args:
             note: The note to find (e.g., 'C', 'F#')
-            string: The string to search on (e.g., 'E', 'A')
             
         Returns:
-            List of fret positions where the note appears
+            List of (string, fret) pairs, from the low E string up
         """
-        from config import FRETBOARD
-        return [fret for n, fret in FRETBOARD[string].items() 
-                if NOTE_TO_SEMITONE[n] == NOTE_TO_SEMITONE[note]]
+        strings, frets = NOTE_POSITIONS[note]
+        return [(STRINGS[s], int(f)) for s, f in zip(strings, frets)]
 
     @staticmethod
-    def find_best_position(note: str, string: str, reference_fret: int) -> Optional[int]:
+    def find_best_position(note: str, string: str, reference_fret: int) -> int:
         """Find the best fret position for a note relative to a reference position.
         
         Args:
@@ -92,19 +230,11 @@ class MusicTheory:
             reference_fret: The reference fret position
             
         Returns:
-            The best fret position or None if not found
+            The best fret position (0-12)
         """
-        positions = MusicTheory.get_note_positions(note, string)
-        if not positions:
-            return None
-            
-        best_fret = min(positions, key=lambda f: abs(f - reference_fret))
+        # Each note occurs exactly once per string within frets 0-11
+        best_fret = int(FRETBOARD_MATRIX[STRING_INDEX[string], NOTE_TO_SEMITONE[note]])
         
-        # Try octave adjustments if position is too far
-        if abs(best_fret - reference_fret) > 4:
-            if best_fret > reference_fret and best_fret - 12 >= 0:
-                best_fret -= 12
-            elif best_fret < reference_fret and best_fret + 12 <= 12:
-                best_fret += 12
-                
-        return best_fret 
\ No newline at end of file
+        # If the position is too far, move it up an octave. Frets stay within
+        # 0..12, so only an open string can move (to the 12th fret)
+        return best_fret + 12 * (best_fret == 0) * (reference_fret > 4) 
\ No newline at end of file
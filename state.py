@@ -1,8 +1,17 @@
 """State management for the Fretboard Trainer application."""
 
-from typing import List, Optional, Dict
+from array import array
+from typing import Optional, Sequence
 from dataclasses import dataclass
-from config import NATURAL_NOTES, FRETBOARD
+from config import NOTES, NATURAL_NOTES, STRINGS
+
+# Bit of each string in TrainingState.selected_mask (low E is bit 0)
+STRING_BITS = {s: 1 << i for i, s in enumerate(STRINGS)}
+# Enabled strings for every possible mask, low to high
+_ENABLED_STRINGS = tuple(
+    tuple(s for s, bit in STRING_BITS.items() if mask & bit)
+    for mask in range(1 << len(STRINGS))
+)
 
 @dataclass
 class TrainingState:
@@ -15,36 +24,40 @@ class TrainingState:
     start_time: Optional[float] = None
     
     # Performance tracking
-    times: List[float] = None
+    times: array = None  # array('d') of elapsed seconds
     stable_note_counter: int = 0
     
     # Settings
     show_all_notes: bool = False
     difficulty: str = "Natural Notes Only"
-    selected_strings: Dict[str, bool] = None
+    selected_mask: int = STRING_BITS['E'] | STRING_BITS['A']
     
     def __post_init__(self):
         """Initialize mutable default values."""
-        if self.times is None:
-            self.times = []
-        if self.selected_strings is None:
-            self.selected_strings = {
-                'E': True, 'A': True, 'D': False,
-                'G': False, 'B': False, 'e': False
-            }
+        # Times are stored unboxed and contiguous (8 bytes each)
+        self.times = array('d', self.times or ())
+        # Running total of self.times, kept in step by record_time
+        self._sum_times = sum(self.times)
+    
+    def get_enabled_strings(self) -> Sequence[str]:
+        """Get the currently enabled strings, low to high."""
+        return _ENABLED_STRINGS[self.selected_mask]
     
-    def get_enabled_strings(self) -> List[str]:
-        """Get list of currently enabled strings."""
-        return [s for s, v in self.selected_strings.items() if v]
+    def set_string_enabled(self, string: str, enabled: bool):
+        """Enable or disable drilling on a string."""
+        if enabled:
+            self.selected_mask |= STRING_BITS[string]
+        else:
+            self.selected_mask &= ~STRING_BITS[string]
     
-    def get_available_notes(self) -> List[str]:
+    def get_available_notes(self) -> Sequence[str]:
         """Get list of available notes based on current difficulty."""
         if not self.current_string:
             return []
             
         if self.difficulty == "Natural Notes Only":
             return NATURAL_NOTES
-        return list(FRETBOARD[self.current_string].keys())
+        return NOTES  # Every note occurs on every string
     
     def reset_challenge(self):
         """Reset the current challenge state."""
@@ -65,12 +78,13 @@ class TrainingState:
     def record_time(self, elapsed: float):
         """Record the time taken for the current challenge."""
         self.times.append(elapsed)
+        self._sum_times += elapsed
     
     def get_average_time(self) -> float:
         """Calculate the average time taken for challenges."""
         if not self.times:
             return 0.0
-        return sum(self.times) / len(self.times)
+        return self._sum_times / len(self.times)
     
     def increment_stable_counter(self):
         """Increment the counter for stable note detection."""
@@ -1,5 +1,6 @@
 """UI components for the Fretboard Trainer application."""
 
+import time
 import tkinter as tk
 import ttkbootstrap as ttk
 from typing import Optional, Callable
@@ -17,6 +18,7 @@ class BaseComponent(ttk.Frame):
         """
         super().__init__(parent, **kwargs)
         self.style = ttk.Style()
+        self._last_args = None  # Arguments of the last update that was applied
         self._setup_styles()
     
     def _setup_styles(self):
@@ -24,7 +26,20 @@ class BaseComponent(ttk.Frame):
         pass
     
     def update(self, *args, **kwargs):
-        """Update the component's state and appearance."""
+        """Update the component's state and appearance.
+        
+        Calls with the same arguments as the previous one are skipped, so
+        widgets are only touched when something changed. Subclasses
+        implement _do_update instead of overriding this method.
+        """
+        key = (args, tuple(sorted(kwargs.items())))
+        if key == self._last_args:
+            return
+        self._last_args = key
+        self._do_update(*args, **kwargs)
+    
+    def _do_update(self, *args, **kwargs):
+        """Apply an update to the component's widgets."""
         pass
 
 class LearningControls(BaseComponent):
@@ -71,6 +86,8 @@ class NoteInfoDisplay(BaseComponent):
     
     def __init__(self, parent: ttk.Frame, **kwargs):
         super().__init__(parent, **kwargs)
+        self._pending = {}  # label -> text waiting for the idle flush
+        self._shown = {}  # label -> text currently displayed
         self._create_widgets()
     
     def _create_widgets(self):
@@ -107,17 +124,37 @@ class NoteInfoDisplay(BaseComponent):
         # Bottom separator
         ttk.Separator(self, orient='horizontal').pack(fill=tk.X, pady=5)
     
-    def update(self, note: str, string: str, major_third: str, perfect_fifth: str):
-        """Update the displayed note information."""
-        self.last_note_label.configure(text=f"Last Note: {note} on {string}")
-        self.last_third_label.configure(text=f"Major Third: {major_third}")
-        self.last_fifth_label.configure(text=f"Perfect Fifth: {perfect_fifth}")
+    def _do_update(self, note: str, string: str, major_third: str, perfect_fifth: str):
+        """Update the displayed note information.
+        
+        The new text is applied in a single idle callback, so several updates
+        in a row cost one round of label changes.
+        """
+        if not self._pending:
+            self.after_idle(self._flush)
+        self._pending[self.last_note_label] = f"Last Note: {note} on {string}"
+        self._pending[self.last_third_label] = f"Major Third: {major_third}"
+        self._pending[self.last_fifth_label] = f"Perfect Fifth: {perfect_fifth}"
+    
+    def _flush(self):
+        """Apply pending label text, skipping labels whose text is unchanged."""
+        for label, text in self._pending.items():
+            if self._shown.get(label) != text:
+                label.configure(text=text)
+                self._shown[label] = text
+        self._pending.clear()
 
 class VolumeIndicator(BaseComponent):
     """Volume level indicator."""
     
+    MIN_REDRAW_INTERVAL = 1 / 30  # Seconds; the bar can't usefully redraw faster
+    
     def __init__(self, parent: ttk.Frame, **kwargs):
         super().__init__(parent, **kwargs)
+        self._last_value = -1
+        self._last_redraw = 0.0
+        self._pending_value = -1  # Latest level, applied by _flush
+        self._flush_job = None  # Trailing redraw scheduled for a throttled update
         self._create_widgets()
     
     def _create_widgets(self):
@@ -145,9 +182,30 @@ class VolumeIndicator(BaseComponent):
         )
         self.volume_bar.pack(side=tk.TOP, pady=5, fill=tk.Y)
     
-    def update(self, volume: float):
-        """Update the volume bar value."""
-        self.volume_bar['value'] = min(volume * 100, 100)
+    def _do_update(self, volume: float):
+        """Update the volume bar value.
+        
+        The bar is redrawn at most once per MIN_REDRAW_INTERVAL. An update
+        arriving sooner is held, and a single trailing redraw applies the
+        latest held value once the interval has passed.
+        """
+        self._pending_value = int(min(volume * 100, 100))
+        if self._flush_job is not None:
+            return
+        wait = self._last_redraw + self.MIN_REDRAW_INTERVAL - time.monotonic()
+        if wait > 0:
+            self._flush_job = self.after(int(wait * 1000) + 1, self._flush)
+        else:
+            self._flush()
+    
+    def _flush(self):
+        """Apply the latest volume level, skipping unchanged whole-percent values."""
+        self._flush_job = None
+        value = self._pending_value
+        if value != self._last_value:
+            self._last_value = value
+            self._last_redraw = time.monotonic()
+            self.volume_bar['value'] = value
 
 class StatusBar(BaseComponent):
     """Status bar for displaying application state."""
@@ -166,6 +224,6 @@ class StatusBar(BaseComponent):
         )
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
     
-    def update(self, message: str):
+    def _do_update(self, message: str):
         """Update the status message."""
         self.status_label.configure(text=message) 
\ No newline at end of file